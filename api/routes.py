@@ -1,27 +1,77 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from utils import agent_run_once, mcp_adapter
+import logging
+import msgspec
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from utils import agent_run_once, agent_stream_once, cache_clear, mcp_adapter
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-class InteractReq(BaseModel):
+class InteractReq(msgspec.Struct, kw_only=True):
     user_id: str | None = None
     session_id: str | None = None
     input: str
-class FeedbackReq(BaseModel):
+class FeedbackReq(msgspec.Struct, kw_only=True):
     session_id: str
     rating: int
     correction: str | None = None
 
-@router.post('/interact')
-async def interact(req: InteractReq):
-    out = agent_run_once(req.user_id, req.session_id, req.input)
+# Bodies are decoded and validated by msgspec's C decoder instead of pydantic.
+# strict=False keeps pydantic's lax coercion (e.g. "5" -> 5 for an int field).
+_interact_decoder = msgspec.json.Decoder(InteractReq, strict=False)
+_feedback_decoder = msgspec.json.Decoder(FeedbackReq, strict=False)
+
+def _decode(decoder, body):
+    try:
+        return decoder.decode(body)
+    except msgspec.DecodeError as exc:
+        # Keep 422 bodies list-shaped like FastAPI's validation errors.
+        raise HTTPException(status_code=422, detail=[{'loc': ['body'], 'msg': str(exc), 'type': 'value_error'}])
+
+def _request_body(struct):
+    # Depends(parse_*) hides the body from FastAPI, so publish msgspec's schema.
+    schema = msgspec.json.schema(struct)['$defs'][struct.__name__]
+    return {'requestBody': {'required': True, 'content': {'application/json': {'schema': schema}}}}
+
+async def parse_interact(request: Request) -> InteractReq:
+    return _decode(_interact_decoder, await request.body())
+
+async def parse_feedback(request: Request) -> FeedbackReq:
+    return _decode(_feedback_decoder, await request.body())
+
+@router.post('/interact', openapi_extra=_request_body(InteractReq))
+async def interact(req: InteractReq = Depends(parse_interact)):
+    out = await agent_run_once(req.user_id, req.session_id, req.input)
     return out
 
-@router.post('/feedback')
-async def feedback(req: FeedbackReq):
+@router.post('/interact/stream', openapi_extra=_request_body(InteractReq))
+async def interact_stream(req: InteractReq = Depends(parse_interact)):
+    async def event_gen():
+        try:
+            async for event, data in agent_stream_once(req.user_id, req.session_id, req.input):
+                yield b'event: ' + event.encode() + b'\ndata: ' + orjson.dumps(data) + b'\n\n'
+        except Exception as exc:
+            # Headers are already sent, so report failures as a terminal event.
+            logger.exception('interaction stream failed')
+            yield b'event: error\ndata: ' + orjson.dumps({'detail': str(exc)}) + b'\n\n'
+    # Disable proxy buffering so events reach the client as they are produced.
+    headers = {'Cache-Control':'no-cache','X-Accel-Buffering':'no'}
+    return StreamingResponse(event_gen(), media_type='text/event-stream', headers=headers)
+
+@router.post('/feedback', openapi_extra=_request_body(FeedbackReq))
+async def feedback(req: FeedbackReq = Depends(parse_feedback)):
     return {'status':'ok'}
 
 @router.get('/tools/discover')
-async def discover_tools():
-    return mcp_adapter.list_tools()
+async def discover_tools(request: Request):
+    body, etag = mcp_adapter.list_tools_json()
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers={'ETag': etag})
+    return Response(content=body, media_type='application/json', headers={'ETag': etag})
+
+@router.delete('/admin/cache')
+async def clear_cache():
+    cache_clear()
+    return {'status':'ok'}
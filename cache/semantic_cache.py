@@ -0,0 +1,111 @@
+"""Semantic response cache gating the reasoning step.
+
+Lookups are two-stage: a nearest-neighbour search over MiniLM embeddings of
+past inputs, followed by a structural check that the entities mentioned in
+the new input overlap those of the cached one. The second stage keeps
+similarly-worded requests about different people or things from sharing a
+response.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+import faiss
+import numpy as np
+
+from memory.vector_store import EMBEDDING_DIM
+
+SEMANTIC_CACHE_ENABLED = os.getenv("AGENT_SEMANTIC_CACHE") == "1"
+SIMILARITY_THRESHOLD = 0.92
+ENTITY_OVERLAP_THRESHOLD = 0.6
+MAX_ENTRIES = 1024
+
+
+class SemanticCache:
+    """Response cache keyed on normalized input embeddings and entity sets.
+
+    Entries are scoped to the user that produced them and bounded to
+    ``max_entries``; the oldest entry is evicted first once full.
+    """
+
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        similarity_threshold: float = SIMILARITY_THRESHOLD,
+        entity_overlap_threshold: float = ENTITY_OVERLAP_THRESHOLD,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.similarity_threshold = similarity_threshold
+        self.entity_overlap_threshold = entity_overlap_threshold
+        self.max_entries = max_entries
+        # Insertion-ordered id -> (user_id, entities, response), oldest first.
+        self._entries: "OrderedDict[int, Tuple[str, FrozenSet[str], str]]" = OrderedDict()
+        self._user_ids: Dict[str, Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, query: np.ndarray, entities: Iterable[str], user_id: str
+    ) -> Optional[str]:
+        """Return a cached response for an equivalent input by the same user.
+
+        Args:
+            query: Normalized embedding of the input, shape (1, dim).
+            entities: Entities extracted from the input.
+            user_id: Only entries stored for this user are considered.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        with self._lock:
+            ids = self._user_ids.get(user_id)
+            if not ids:
+                return None
+            candidates = np.fromiter(ids, dtype=np.int64, count=len(ids))
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(candidates))
+            scores, found = self.index.search(query, 1, params=params)
+            best = int(found[0, 0])
+            if best < 0 or scores[0, 0] <= self.similarity_threshold:
+                return None
+            _, cached_entities, response = self._entries[best]
+
+        wanted = set(entities)
+        if wanted or cached_entities:
+            overlap = len(wanted & cached_entities) / max(1, len(wanted))
+            if overlap <= self.entity_overlap_threshold:
+                return None
+        return response
+
+    def insert(
+        self, query: np.ndarray, entities: Iterable[str], response: str, user_id: str
+    ) -> None:
+        """Store a response for the input embedded as query.
+
+        Args:
+            query: Normalized embedding of the input, shape (1, dim).
+            entities: Entities extracted from the input.
+            response: Response produced for the input.
+            user_id: User the response was produced for.
+        """
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add_with_ids(query, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = (user_id, frozenset(entities), response)
+            self._user_ids.setdefault(user_id, set()).add(entry_id)
+            if len(self._entries) > self.max_entries:
+                self._evict_oldest_locked()
+
+    def _evict_oldest_locked(self) -> None:
+        oldest, (owner, _, _) = self._entries.popitem(last=False)
+        self.index.remove_ids(np.array([oldest], dtype=np.int64))
+        owned = self._user_ids[owner]
+        owned.discard(oldest)
+        if not owned:
+            del self._user_ids[owner]
+
+
+semantic_cache = SemanticCache()
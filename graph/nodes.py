@@ -1,14 +1,21 @@
-from typing import Any, Dict, List, TypedDict
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from cache.semantic_cache import SEMANTIC_CACHE_ENABLED, semantic_cache
+from mcp.mcp_adapter import mcp_adapter
+from memory.vector_store import embed, memory_store
 
 __all__ = [
     "AgentState",
-    "ensure_state_defaults",
     "perception_node",
     "goal_setting_node",
     "memory_recall_node",
     "reasoning_node",
     "planning_node",
     "action_node",
+    "action_node_async",
     "self_reflection_node",
     "feedback_node",
     "memory_write_node",
@@ -19,59 +26,51 @@ __all__ = [
 Node definitions for the agent workflow graph.
 
 Each node is a pure function that:
-- Accepts a mutable "state" dictionary (AgentState).
-- Mutates the state with new keys relevant to its responsibility.
+- Accepts a mutable AgentState instance.
+- Mutates the state fields relevant to its responsibility.
 - Returns the same state for downstream nodes.
 
 Nodes included:
 - perception_node: Sanitizes input and infers lightweight signals (e.g., entities).
 - goal_setting_node: Extracts and persists explicit goals.
-- memory_recall_node: Retrieves relevant memories (stub).
-- reasoning_node: Produces a model-driven response (stub).
+- memory_recall_node: Retrieves relevant memories from the vector store.
+- reasoning_node: Produces a model-driven response (stub), behind a semantic cache.
 - planning_node: Produces a lightweight execution plan.
 - action_node: Executes tools/APIs based on plan (stub).
+- action_node_async: Executes planned tools concurrently through MCP.
 - self_reflection_node: Reflects on outcomes (stub).
 - feedback_node: Records explicit/implicit feedback (stub).
-- memory_write_node: Persists new memories (stub).
+- memory_write_node: Persists new memories to the vector store.
 """
 
 
-class AgentState(TypedDict):
-    """Typed workflow state shared across all nodes."""
-    user_input: str
-    sanitized_input: str
-    entities: List[str]
-    goals: List[str]
-    plan: List[str]
-    action_results: List[str]
-    memories_retrieved: List[str]
-    memories_to_write: List[str]
-    feedback: Dict[str, Any]
-    response: str
-
+# Naive entity heuristic: capitalized tokens (placeholder for NER).
+_CAP_RE = re.compile(r"\b[A-Z][A-Za-z0-9'\-]*\b")
+# Matches "meeting"/"meetings" but not words that merely contain it.
+_MEETING_RE = re.compile(r"\bmeetings?\b", re.I)
 
-def ensure_state_defaults(state: Dict[str, Any]) -> AgentState:
-    """Return AgentState with defaults for any missing keys.
 
-    Args:
-        state: A possibly-partial state mapping.
+@dataclass(slots=True, kw_only=True)
+class AgentState:
+    """Typed workflow state shared across all nodes.
 
-    Returns:
-        A fully-populated AgentState with sensible defaults.
+    Defaults are supplied once at construction, so nodes can read and
+    mutate fields directly without re-normalizing the state. Sequence fields
+    default to a shared empty tuple; nodes assign a new list instead of
+    appending, so untouched fields never allocate.
     """
-    typed: AgentState = {
-        "user_input": str(state.get("user_input", "")),
-        "sanitized_input": str(state.get("sanitized_input", "")),
-        "entities": list(state.get("entities", [])),
-        "goals": list(state.get("goals", [])),
-        "plan": list(state.get("plan", [])),
-        "action_results": list(state.get("action_results", [])),
-        "memories_retrieved": list(state.get("memories_retrieved", [])),
-        "memories_to_write": list(state.get("memories_to_write", [])),
-        "feedback": state.get("feedback"),
-        "response": str(state.get("response", "")),
-    }
-    return typed
+    user_input: str = ""
+    user_id: str = ""
+    session_id: str = ""
+    sanitized_input: str = ""
+    entities: Sequence[str] = ()
+    goals: Sequence[str] = ()
+    plan: Sequence[str] = ()
+    action_results: Sequence[str] = ()
+    memories_retrieved: Sequence[str] = ()
+    memories_to_write: Sequence[str] = ()
+    feedback: Optional[Dict[str, Any]] = None
+    response: str = ""
 
 
 def perception_node(state: AgentState) -> AgentState:
@@ -86,14 +85,11 @@ def perception_node(state: AgentState) -> AgentState:
             - "sanitized_input": Trimmed user input.
             - "entities": Naive entity list (e.g., capitalized tokens).
     """
-    state = ensure_state_defaults(state)
-    text = state["user_input"].strip()
-    state["sanitized_input"] = text
+    text = state.user_input.strip()
+    state.sanitized_input = text
 
-    # Naive entity heuristic: capitalized tokens (placeholder for NER).
-    if text and not state["entities"]:
-        tokens = [w.strip(",.!?;:") for w in text.split()]
-        state["entities"] = [w for w in tokens if w[:1].isupper()]
+    if text and not state.entities:
+        state.entities = _CAP_RE.findall(text)
 
     return state
 
@@ -112,11 +108,10 @@ def goal_setting_node(state: AgentState) -> AgentState:
         The updated state with:
             - "goals": List of goals including any newly extracted goal.
     """
-    state = ensure_state_defaults(state)
-    text = state["sanitized_input"]
+    text = state.sanitized_input
 
     if text and (text.endswith((".", "!", "?")) or len(text.split()) > 3):
-        state["goals"].append(text)
+        state.goals = [*state.goals, text]
 
     return state
 
@@ -124,21 +119,22 @@ def goal_setting_node(state: AgentState) -> AgentState:
 def memory_recall_node(state: AgentState) -> AgentState:
     """Retrieve relevant memories for the current user and input context.
 
-    This is a stub that illustrates where vector DB retrieval would occur.
-
     Args:
-        state: Workflow state.
+        state: Workflow state. Expected keys:
+            - "sanitized_input": Cleaned user text used as the query.
+            - "user_id" / "session_id": Scope of memories to search.
 
     Returns:
         The updated state with:
             - "memories_retrieved": A list of memory snippets (strings).
     """
-    state = ensure_state_defaults(state)
-
-    # TODO: Integrate memory retrieval using mem0.ai or pgvector.
-    # Placeholder: keep as empty list or attach mock snippets.
-    if not state["memories_retrieved"]:
-        state["memories_retrieved"] = []
+    if not state.memories_retrieved:
+        state.memories_retrieved = memory_store.recall(
+            query=state.sanitized_input,
+            user_id=state.user_id,
+            session_id=state.session_id,
+            k=5,
+        )
 
     return state
 
@@ -146,15 +142,32 @@ def memory_recall_node(state: AgentState) -> AgentState:
 def reasoning_node(state: AgentState) -> AgentState:
     """Produce a response from context (placeholder for LLM reasoning).
 
+    When ``AGENT_SEMANTIC_CACHE=1``, a semantically equivalent earlier input
+    from the same user with overlapping entities short-circuits to its
+    cached response.
+
     Args:
-        state: Workflow state.
+        state: Workflow state. Expected keys:
+            - "sanitized_input": Cleaned user text.
+            - "entities": Entities used to validate cache hits.
+            - "user_id": Scope of cached responses.
 
     Returns:
         The updated state with:
             - "response": A placeholder response string.
     """
-    state = ensure_state_defaults(state)
-    state["response"] = "Stub response: planned action"
+    query = None
+    if SEMANTIC_CACHE_ENABLED and state.sanitized_input:
+        query = embed([state.sanitized_input])
+        cached = semantic_cache.lookup(query, state.entities, state.user_id)
+        if cached is not None:
+            state.response = cached
+            return state
+
+    state.response = "Stub response: planned action"
+
+    if query is not None:
+        semantic_cache.insert(query, state.entities, state.response, state.user_id)
     return state
 
 
@@ -169,13 +182,12 @@ def planning_node(state: AgentState) -> AgentState:
         The updated state with:
             - "plan": A list of plan step names as strings.
     """
-    state = ensure_state_defaults(state)
     plan: List[str] = []
 
-    if "meeting" in state["sanitized_input"].lower():
+    if _MEETING_RE.search(state.sanitized_input):
         plan.append("calendar.create_event")
 
-    state["plan"] = plan
+    state.plan = plan
     return state
 
 
@@ -190,16 +202,51 @@ def action_node(state: AgentState) -> AgentState:
         The updated state with:
             - "action_results": Execution outcomes per step as strings.
     """
-    state = ensure_state_defaults(state)
-
-    if state["plan"]:
-        state["action_results"] = ["ok" for _ in state["plan"]]
+    if state.plan:
+        state.action_results = ["ok" for _ in state.plan]
     else:
-        state["action_results"] = ["ok"]
+        state.action_results = ["ok"]
 
     return state
 
 
+async def action_node_async(state: AgentState) -> AgentState:
+    """Execute planned tools concurrently through the MCP adapter.
+
+    Plan steps are independent, so all tool calls are awaited together and
+    the step latency is bounded by the slowest tool rather than their sum.
+
+    Args:
+        state: Workflow state. Expected keys:
+            - "plan": List of planned steps (tool names).
+
+    Returns:
+        The updated state with:
+            - "action_results": "ok" or "error: <reason>" per step.
+    """
+    if not state.plan:
+        state.action_results = ["ok"]
+        return state
+
+    payload = {
+        "user_id": state.user_id,
+        "input": state.sanitized_input,
+        "entities": state.entities,
+    }
+    outcomes = await asyncio.gather(
+        *(mcp_adapter.execute(step, dict(payload)) for step in state.plan),
+        return_exceptions=True,
+    )
+    # A cancelled tool comes back as CancelledError, which is not an Exception.
+    state.action_results = [
+        f"error: {str(outcome) or type(outcome).__name__}"
+        if isinstance(outcome, BaseException)
+        else "ok"
+        for outcome in outcomes
+    ]
+    return state
+
+
 def self_reflection_node(state: AgentState) -> AgentState:
     """Analyze action outcomes and produce reflections or adjustments (stub).
 
@@ -211,8 +258,7 @@ def self_reflection_node(state: AgentState) -> AgentState:
         The updated state with:
             - "feedback": A simple placeholder rating or notes.
     """
-    state = ensure_state_defaults(state)
-    state["feedback"] = {"rating": 5}
+    state.feedback = {"rating": 5}
     return state
 
 
@@ -226,9 +272,8 @@ def feedback_node(state: AgentState) -> AgentState:
         The updated state with:
             - "feedback": Placeholder explicit feedback if not already present.
     """
-    state = ensure_state_defaults(state)
-    if not state["feedback"]:
-        state["feedback"] = {"rating": 5}
+    if not state.feedback:
+        state.feedback = {"rating": 5}
     return state
 
 
@@ -240,13 +285,11 @@ def memory_write_node(state: AgentState) -> AgentState:
             - "memories_to_write": List of memories to be written.
 
     Returns:
-        The updated state.
+        The updated state with:
+            - "memories_to_write": Emptied once queued for the vector store.
     """
-    state = ensure_state_defaults(state)
-
-    # TODO: Implement memory writing logic.
-    # Placeholder: assume memories are written successfully.
-    if state["memories_to_write"]:
-        state["memories_to_write"] = []
+    if state.memories_to_write:
+        memory_store.add(state.memories_to_write, state.user_id, state.session_id)
+        state.memories_to_write = ()
 
     return state
\ No newline at end of file
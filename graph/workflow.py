@@ -4,23 +4,30 @@ This module composes the functional nodes defined in graph.nodes into a
 LangGraph StateGraph and provides a helper to execute the pipeline once.
 """
 
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import fields
+from hashlib import blake2b
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
 
-import uuid
+import asyncio
+import os
+import threading
+from langgraph.errors import GraphRecursionError
 from langgraph.graph import END, StateGraph
 
 from graph.nodes import (
     AgentState,
-    ensure_state_defaults,
     perception_node,
     goal_setting_node,
     memory_recall_node,
     reasoning_node,
     planning_node,
     action_node,
+    action_node_async,
     feedback_node,
     memory_write_node,
 )
+from ids import next_id
 
 
 def is_task_complete(state: AgentState) -> bool:
@@ -37,16 +44,13 @@ def is_task_complete(state: AgentState) -> bool:
     Returns:
         True if the task is complete, False otherwise.
     """
-    plan: List[str] = state.get("plan", [])
-    results: List[str] = state.get("action_results", [])
-
-    if not plan:
-        return True
-
-    if plan and len(results) >= len(plan) and all(r == "ok" for r in results[: len(plan)]):
+    plan_len = len(state.plan)
+    if not plan_len:
         return True
 
-    return False
+    results: Sequence[str] = state.action_results
+    # count() compares in C and avoids a Python-level generator per result.
+    return len(results) >= plan_len and results[:plan_len].count("ok") == plan_len
 
 
 # Build the graph
@@ -58,14 +62,14 @@ graph.add_node("GoalSetting", goal_setting_node)
 graph.add_node("MemoryRecall", memory_recall_node)
 graph.add_node("Reasoning", reasoning_node)
 graph.add_node("Planning", planning_node)
-graph.add_node("ToolExecution", action_node)
+graph.add_node("ToolExecution", action_node_async)
 graph.add_node("FeedbackProcessing", feedback_node)
 graph.add_node("MemoryWrite", memory_write_node)
 
 # Entry and edges
 graph.set_entry_point("Perception")
 
-# Perception -> GoalSetting -> MemoryRecall -> Reasoning -> Planning -> ToolExecution -> Feedback -> MemoryWrite
+# Perception -> GoalSetting -> MemoryRecall -> Reasoning -> Planning -> ToolExecution -> Feedback -> MemoryWrite -> END
 graph.add_edge("Perception", "GoalSetting")
 graph.add_edge("GoalSetting", "MemoryRecall")
 graph.add_edge("MemoryRecall", "Reasoning")
@@ -73,23 +77,111 @@ graph.add_edge("Reasoning", "Planning")
 graph.add_edge("Planning", "ToolExecution")
 graph.add_edge("ToolExecution", "FeedbackProcessing")
 graph.add_edge("FeedbackProcessing", "MemoryWrite")
+# A failed step ends the run like any other: its error is reported to the
+# caller rather than retried, since tools may not be idempotent.
+graph.add_edge("MemoryWrite", END)
 
 
-def should_continue(state: AgentState) -> str:
-    """Router to control loop after memory write."""
-    return "continue" if not is_task_complete(state) else "end"
+# Compiled once at import and shared by every request.
+agent = graph.compile()
 
 
-graph.add_conditional_edges(
-    "MemoryWrite",
-    should_continue,
-    {
-        "continue": "Reasoning",
-        "end": END,
-    },
+# Execution cache: repeat (user_input, user_id) pairs skip the pipeline.
+_CACHE_ENABLED = os.getenv("AGENT_CACHE") == "1"
+_CACHE_MAXSIZE = 1024
+_cache: "OrderedDict[str, Tuple[Any, ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+# Fields derived from the raw input or the session are recomputed on a hit
+# rather than cached: the key normalizes case/whitespace and omits session_id.
+_RECOMPUTED_FIELDS = frozenset(
+    {"user_input", "user_id", "session_id", "sanitized_input", "entities", "goals", "memories_retrieved"}
+)
+_CACHED_FIELDS: Tuple[str, ...] = tuple(
+    f.name for f in fields(AgentState) if f.name not in _RECOMPUTED_FIELDS
 )
 
-agent = graph.compile()
+
+def _cache_key(user_id: Optional[str], user_input: str) -> str:
+    """Return a content hash of the normalized input and user id."""
+    normalized = user_input.strip().lower() + "|" + (user_id or "")
+    return blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def _cached_run(key: str) -> Optional[Tuple[Any, ...]]:
+    """Return the frozen state stored under key, or None on a miss."""
+    with _cache_lock:
+        frozen = _cache.get(key)
+        if frozen is not None:
+            _cache.move_to_end(key)
+        return frozen
+
+
+def _cache_store(key: str, state: AgentState) -> None:
+    """Freeze the cacheable fields of state into a tuple stored under key."""
+    frozen = tuple(
+        tuple(v) if isinstance(v, list) else v
+        for v in (getattr(state, name) for name in _CACHED_FIELDS)
+    )
+    with _cache_lock:
+        _cache[key] = frozen
+        _cache.move_to_end(key)
+        if len(_cache) > _CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+
+
+def _is_cacheable(state: AgentState) -> bool:
+    """Return True if a finished run may be replayed from the cache.
+
+    Runs that executed tools are never cached: a replay would skip the
+    tools' side effects and would keep returning a transient failure.
+    """
+    return not state.plan
+
+
+def _thaw(
+    frozen: Tuple[Any, ...],
+    user_id: Optional[str],
+    session_id: Optional[str],
+    user_input: str,
+) -> AgentState:
+    """Rebuild an AgentState from a cached entry for the current request.
+
+    Cached downstream results are reused as-is; perception, goal setting and
+    memory recall are re-run so the input-derived fields match user_input and
+    recalled memories belong to this session and reflect recent writes.
+    """
+    values: Dict[str, Any] = {
+        name: list(v) if isinstance(v, tuple) else dict(v) if isinstance(v, dict) else v
+        for name, v in zip(_CACHED_FIELDS, frozen)
+    }
+    state = AgentState(
+        user_input=user_input,
+        user_id=user_id or next_id(),
+        session_id=session_id or next_id(),
+        **values,
+    )
+    for fn in (perception_node, goal_setting_node, memory_recall_node):
+        state = fn(state)
+    return state
+
+
+def cache_clear() -> None:
+    """Drop every entry from the execution cache."""
+    with _cache_lock:
+        _cache.clear()
+
+
+# Linear node order used by run_graph_once; follows the graph edges above.
+_PIPELINE: Tuple[Callable[[AgentState], AgentState], ...] = (
+    perception_node,
+    goal_setting_node,
+    memory_recall_node,
+    reasoning_node,
+    planning_node,
+    action_node,
+    feedback_node,
+    memory_write_node,
+)
 
 
 def run_graph_once(user_id: Optional[str], session_id: Optional[str], user_input: str) -> AgentState:
@@ -105,28 +197,112 @@ def run_graph_once(user_id: Optional[str], session_id: Optional[str], user_input
 
     Returns:
         The final AgentState produced by the pipeline.
+
+    When the ``AGENT_CACHE=1`` environment variable is set, results are cached
+    by a hash of the normalized input and user id; hits return a copy of the
+    prior state with fresh identifiers instead of re-running the nodes. Runs
+    that planned tool steps are not cached.
     """
-    # Start with minimal inputs and fill defaults to conform to AgentState.
-    base_state: Dict[str, Any] = {
+    key = _cache_key(user_id, user_input) if _CACHE_ENABLED else None
+    if key is not None:
+        frozen = _cached_run(key)
+        if frozen is not None:
+            return _thaw(frozen, user_id, session_id, user_input)
+
+    # Build the state once; the dataclass supplies defaults for every field.
+    state = AgentState(
+        user_input=user_input,
+        user_id=user_id or next_id(),
+        session_id=session_id or next_id(),
+    )
+
+    for fn in _PIPELINE:
+        state = fn(state)
+
+    if key is not None and _is_cacheable(state):
+        _cache_store(key, state)
+
+    return state
+
+
+def _graph_input(
+    user_id: Optional[str], session_id: Optional[str], user_input: str
+) -> Dict[str, Any]:
+    """Build the initial graph input, generating missing identifiers."""
+    return {
         "user_input": user_input,
+        "user_id": user_id or next_id(),
+        "session_id": session_id or next_id(),
     }
-    state: AgentState = ensure_state_defaults(base_state)
-
-    # Attach non-typed extra metadata commonly used by nodes.
-    state["user_id"] = user_id or str(uuid.uuid4())  # type: ignore[index]
-    state["session_id"] = session_id or str(uuid.uuid4())  # type: ignore[index]
-
-    # Follow the same order as the graph edges above.
-    for fn in [
-        perception_node,
-        goal_setting_node,
-        memory_recall_node,
-        reasoning_node,
-        planning_node,
-        action_node,
-        feedback_node,
-        memory_write_node,
-    ]:
-        state = fn(state)
 
-    return state
\ No newline at end of file
+
+async def arun_graph_once(
+    user_id: Optional[str], session_id: Optional[str], user_input: str
+) -> AgentState:
+    """Execute the compiled LangGraph agent once.
+
+    Unlike run_graph_once, this goes through the graph runtime and runs
+    tool steps concurrently. It shares the ``AGENT_CACHE`` execution cache
+    with run_graph_once.
+
+    Args:
+        user_id: Optional user identifier; auto-generated if None.
+        session_id: Optional session identifier; auto-generated if None.
+        user_input: Raw user message.
+
+    Returns:
+        The final AgentState produced by the graph. If the graph hits its
+        recursion limit, a state carrying an error result is returned
+        instead of raising (and is not cached).
+    """
+    key = _cache_key(user_id, user_input) if _CACHE_ENABLED else None
+    if key is not None:
+        frozen = _cached_run(key)
+        if frozen is not None:
+            # Recall may embed the query, so keep it off the event loop.
+            return await asyncio.to_thread(_thaw, frozen, user_id, session_id, user_input)
+
+    graph_input = _graph_input(user_id, session_id, user_input)
+    try:
+        values = await agent.ainvoke(graph_input)
+    except GraphRecursionError:
+        return AgentState(
+            **graph_input,
+            action_results=["error: step limit reached before the task completed"],
+            response="Stopped: the task did not complete within the step limit.",
+        )
+    state = AgentState(**values)
+
+    if key is not None and _is_cacheable(state):
+        _cache_store(key, state)
+
+    return state
+
+
+async def astream_graph_once(
+    user_id: Optional[str], session_id: Optional[str], user_input: str
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Stream a single execution of the compiled LangGraph agent.
+
+    Args:
+        user_id: Optional user identifier; auto-generated if None.
+        session_id: Optional session identifier; auto-generated if None.
+        user_input: Raw user message.
+
+    Yields:
+        ("update", {node: state}) as each node finishes, then a single
+        ("state", values) with the final state. Nodes return the whole
+        AgentState, so every update carries the full state rather than a
+        delta.
+    """
+    final: Optional[Dict[str, Any]] = None
+    async for mode, chunk in agent.astream(
+        _graph_input(user_id, session_id, user_input),
+        stream_mode=["updates", "values"],
+    ):
+        if mode == "updates":
+            yield "update", chunk
+        else:
+            final = chunk
+    if final is not None:
+        yield "state", final
@@ -0,0 +1,22 @@
+"""Production server settings: gunicorn -c gunicorn.conf.py main:app
+
+Development keeps using `uv run main.py`, which starts a single reloading
+uvicorn process.
+
+Workers default to one. The FAISS memory store, the execution cache and the
+LangGraph node cache all live inside each worker process, so with several
+workers a memory written in one worker cannot be recalled from another and
+DELETE /admin/cache only clears the worker that served it. Raise
+WEB_CONCURRENCY (2 * CPUs + 1 is a common starting point) only once memory
+is backed by an external store, and keep
+WEB_CONCURRENCY * PG_POOL_MAX_SIZE below Postgres' max_connections.
+"""
+
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8080")
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Import the app (and compile the graph) once in the master, then fork, so
+# workers share those pages copy-on-write.
+preload_app = True
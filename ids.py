@@ -0,0 +1,33 @@
+"""Identifier generation backed by a pre-filled pool of random UUIDs.
+
+One os.urandom call fills the pool with 1024 version-4 UUIDs, so the
+entropy syscall is paid once per 1024 identifiers instead of per request.
+"""
+
+import collections
+import os
+import threading
+import uuid
+
+_POOL_SIZE = 1024
+
+_BUF = collections.deque(maxlen=_POOL_SIZE)
+_LOCK = threading.Lock()
+
+
+def _refill() -> None:
+    rb = os.urandom(16 * _POOL_SIZE)
+    for i in range(_POOL_SIZE):
+        _BUF.append(uuid.UUID(bytes=rb[i * 16:(i + 1) * 16], version=4))
+
+
+def next_id() -> str:
+    """Return a new random UUID4 string."""
+    with _LOCK:
+        if not _BUF:
+            _refill()
+        return str(_BUF.popleft())
+
+
+# Forked workers must not hand out the parent's remaining identifiers.
+os.register_at_fork(after_in_child=_BUF.clear)
@@ -1,10 +1,20 @@
+import asyncio
+import contextlib
+import logging
 import uvicorn
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI
-from utils import agent_run_once, mcp_adapter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from api import routes
-from mcp.mcp_adapter import mcp_adapter
+from memory import pg
+from memory.vector_store import memory_store
 
-app = FastAPI(title='Agentic Productivity Helper')
+MEMORY_FLUSH_INTERVAL = 5.0
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title='Agentic Productivity Helper', default_response_class=ORJSONResponse)
 
 app.include_router(routes.router)
 
@@ -14,12 +24,36 @@ try:
 except Exception:
     pass
 
+@app.on_event('startup')
+async def size_default_executor():
+    # LangGraph runs sync graph nodes on the loop's default executor.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=64))
+
+async def flush_memories_periodically():
+    while True:
+        await asyncio.sleep(MEMORY_FLUSH_INTERVAL)
+        try:
+            await run_in_threadpool(memory_store.flush)
+        except Exception:
+            logger.exception('memory flush failed; retrying next interval')
+
+@app.on_event('startup')
+async def start_memory_flush():
+    app.state.memory_flush_task = asyncio.create_task(flush_memories_periodically())
+
+@app.on_event('shutdown')
+async def stop_memory_flush():
+    app.state.memory_flush_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await app.state.memory_flush_task
+
+@app.on_event('shutdown')
+async def close_pg_pool():
+    await pg.close_pool()
+
 @app.get('/health')
 async def health():
     return {'status':'ok'}
 
-# expose for routes
-from graph.workflow import run_graph_once as agent_run_once 
-
 if __name__ == '__main__':
     uvicorn.run('main:app', host='0.0.0.0', port=8080, reload=True)
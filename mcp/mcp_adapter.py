@@ -1,12 +1,21 @@
+import asyncio
+import inspect
 from mcp.tool_registry import registry
+from mcp.tools import calendar
 class MCPAdapter:
     def __init__(self, registry):
         self.registry = registry
     def list_tools(self):
         return self.registry.get_tools_metadata()
+    def list_tools_json(self):
+        return self.registry.get_tools_metadata_json()
     async def execute(self, tool_name, payload):
         func = self.registry.get_tool(tool_name)
-        if not func:
+        if func is None:
             raise ValueError('tool not found')
-        return func(payload)
+        if inspect.iscoroutinefunction(func):
+            return await func(payload)
+        # Sync tools run in a worker thread so they never block the loop.
+        return await asyncio.to_thread(func, payload)
+registry.register('calendar.create_event', {'skill':'calendar','description':'Create a calendar event'}, calendar.create_event)
 mcp_adapter = MCPAdapter(registry)
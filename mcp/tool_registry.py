@@ -1,10 +1,28 @@
+from hashlib import blake2b
+from types import MappingProxyType
+import orjson
 class ToolRegistry:
+    __slots__ = ('_meta', '_func', '_meta_view', '_meta_json', '_meta_etag')
     def __init__(self):
-        self._tools = {}
+        self._meta = {}
+        self._func = {}
+        # Read-only live view; reflects later registrations without copying.
+        self._meta_view = MappingProxyType(self._meta)
+        self._meta_json = None
+        self._meta_etag = None
     def register(self, name, meta, func):
-        self._tools[name] = {'meta':meta,'func':func}
+        self._meta[name] = meta
+        self._func[name] = func
+        self._meta_json = None
     def get_tools_metadata(self):
-        return {k:v['meta'] for k,v in self._tools.items()}
+        return self._meta_view
+    def get_tools_metadata_json(self):
+        # Serialized once per registry change; returns (body, quoted ETag).
+        if self._meta_json is None:
+            body = orjson.dumps(self._meta)
+            self._meta_etag = '"%s"' % blake2b(body, digest_size=8).hexdigest()
+            self._meta_json = body
+        return self._meta_json, self._meta_etag
     def get_tool(self, name):
-        return self._tools.get(name,{}).get('func')
+        return self._func.get(name)
 registry = ToolRegistry()
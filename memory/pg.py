@@ -0,0 +1,112 @@
+"""pgvector-backed memory recall over a shared asyncpg connection pool.
+
+Expects a table of the form::
+
+    CREATE TABLE memories (
+        id bigserial PRIMARY KEY,
+        user_id text NOT NULL,
+        session_id text,
+        content text NOT NULL,
+        embedding vector(384) NOT NULL
+    );
+
+The pool registers pgvector's asyncpg codec on every connection, so vectors
+travel in Postgres' binary format rather than as text literals. It is opened
+from ``DATABASE_URL`` on first use, so processes that never recall from
+Postgres hold no connections.
+"""
+
+import asyncio
+import os
+from typing import List, Optional
+
+import asyncpg
+import numpy as np
+from pgvector.asyncpg import register_vector
+
+pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def init_pool(dsn: str, min_size: int = 4, max_size: int = 20) -> asyncpg.Pool:
+    """Create the shared connection pool.
+
+    Args:
+        dsn: Postgres connection string.
+        min_size: Connections opened eagerly and kept warm.
+        max_size: Upper bound on concurrent connections.
+
+    Returns:
+        The initialized pool.
+    """
+    global pool
+    pool = await asyncpg.create_pool(
+        dsn,
+        min_size=min_size,
+        max_size=max_size,
+        init=register_vector,
+        # Recycle idle connections instead of pinging on every acquire.
+        max_inactive_connection_lifetime=300,
+    )
+    return pool
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the shared pool, opening it from the environment on first use.
+
+    The pool is sized per worker process by ``PG_POOL_MAX_SIZE``.
+
+    Returns:
+        The initialized pool.
+    """
+    if pool is not None:
+        return pool
+    async with _pool_lock:
+        if pool is not None:
+            return pool
+        dsn = os.getenv("DATABASE_URL")
+        if not dsn:
+            raise RuntimeError("DATABASE_URL is not set")
+        max_size = int(os.getenv("PG_POOL_MAX_SIZE", 20))
+        return await init_pool(dsn, min_size=min(4, max_size), max_size=max_size)
+
+
+async def close_pool() -> None:
+    """Close the shared connection pool if it was initialized."""
+    global pool
+    if pool is not None:
+        await pool.close()
+        pool = None
+
+
+async def recall(
+    q: np.ndarray,
+    user_id: str,
+    session_id: Optional[str] = None,
+    k: int = 5,
+) -> List[str]:
+    """Return up to k of the user's memories closest to the query embedding.
+
+    Args:
+        q: Normalized query embedding.
+        user_id: Restrict results to this user's memories.
+        session_id: Optionally restrict results to a single session.
+        k: Maximum number of memories to return.
+
+    Returns:
+        Memory contents ordered by descending inner product.
+    """
+    async with (await get_pool()).acquire() as conn:
+        if session_id is None:
+            rows = await conn.fetch(
+                "SELECT content FROM memories WHERE user_id = $1 "
+                "ORDER BY embedding <#> $2 LIMIT $3",
+                user_id, q, k,
+            )
+        else:
+            rows = await conn.fetch(
+                "SELECT content FROM memories WHERE user_id = $1 AND session_id = $2 "
+                "ORDER BY embedding <#> $3 LIMIT $4",
+                user_id, session_id, q, k,
+            )
+    return [row["content"] for row in rows]
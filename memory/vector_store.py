@@ -0,0 +1,162 @@
+"""In-process vector memory backed by a FAISS inner-product index.
+
+Texts are embedded with a local MiniLM sentence encoder and normalized, so
+inner product equals cosine similarity and recall is a single dot-product
+sweep over the index instead of a remote round-trip. Each memory is tagged
+with its user and session so recall only scores that owner's vectors.
+"""
+
+import threading
+from functools import lru_cache
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence
+
+import faiss
+import numpy as np
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model() -> "SentenceTransformer":
+    """Load the sentence embedding model once per process.
+
+    The import is deferred so torch is only loaded when something is
+    actually embedded, not when the graph modules are imported.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+def embed(texts: Iterable[str], batch_size: int = 32) -> np.ndarray:
+    """Encode texts into normalized float32 embeddings of shape (n, dim)."""
+    vectors = get_embedding_model().encode(
+        list(texts),
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _owner_key(value: Optional[str]) -> int:
+    """Hash a user or session id into a signed 64-bit integer."""
+    digest = blake2b((value or "").encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class FAISSMemory:
+    """Memory store over a flat inner-product FAISS index.
+
+    Vectors are stored under sequential ids in an IndexIDMap2, with parallel
+    arrays of hashed user and session ids used to pre-filter searches.
+    Written texts are buffered and embedded in one batched forward pass once
+    ``flush_every`` are pending or flush() is called; buffered memories are
+    not searchable until then.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, flush_every: int = 32):
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.texts: List[str] = []
+        self.flush_every = flush_every
+        self._users = np.empty(0, dtype=np.int64)
+        self._sessions = np.empty(0, dtype=np.int64)
+        self._pending_texts: List[str] = []
+        self._pending_owners: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        texts: Sequence[str],
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Queue texts for embedding and insertion into the index.
+
+        Args:
+            texts: Memory snippets to store.
+            user_id: Owner of the memories.
+            session_id: Session the memories were produced in.
+        """
+        if not texts:
+            return
+        owner = (_owner_key(user_id), _owner_key(session_id))
+        with self._lock:
+            self._pending_texts.extend(texts)
+            self._pending_owners.extend([owner] * len(texts))
+            full = len(self._pending_texts) >= self.flush_every
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Embed all queued texts in one batch and add them to the index."""
+        with self._lock:
+            texts, owners = self._pending_texts, self._pending_owners
+            self._pending_texts, self._pending_owners = [], []
+        if not texts:
+            return
+        # Encode outside the lock so recalls are not blocked by the model.
+        try:
+            vectors = embed(texts, batch_size=self.flush_every)
+        except Exception:
+            # Requeue ahead of newer writes so the next flush retries them.
+            with self._lock:
+                self._pending_texts[:0] = texts
+                self._pending_owners[:0] = owners
+            raise
+        owner_keys = np.array(owners, dtype=np.int64)
+        with self._lock:
+            start = len(self.texts)
+            ids = np.arange(start, start + len(texts), dtype=np.int64)
+            self.index.add_with_ids(vectors, ids)
+            self.texts.extend(texts)
+            self._users = np.concatenate([self._users, owner_keys[:, 0]])
+            self._sessions = np.concatenate([self._sessions, owner_keys[:, 1]])
+
+    def recall(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        k: int = 5,
+    ) -> List[str]:
+        """Return up to k stored memories most similar to query.
+
+        Only memories belonging to the given user and session are scored;
+        a None filter matches any owner.
+
+        Args:
+            query: Text to search for.
+            user_id: Restrict results to this user's memories.
+            session_id: Restrict results to this session's memories.
+            k: Maximum number of memories to return.
+
+        Returns:
+            Memory snippets ordered by descending similarity.
+        """
+        if not query or self.index.ntotal == 0:
+            return []
+        with self._lock:
+            mask = np.ones(len(self.texts), dtype=bool)
+            if user_id is not None:
+                mask &= self._users == _owner_key(user_id)
+            if session_id is not None:
+                mask &= self._sessions == _owner_key(session_id)
+            candidates = np.flatnonzero(mask).astype(np.int64)
+        if candidates.size == 0:
+            return []
+        q = embed([query])
+        # IDSelectorBatch tests membership via a hash set; IDSelectorArray scans
+        # the whole candidate list for every vector.
+        params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(candidates))
+        with self._lock:
+            _, ids = self.index.search(q, min(k, candidates.size), params=params)
+            return [self.texts[i] for i in ids[0] if i >= 0]
+
+
+memory_store = FAISSMemory()
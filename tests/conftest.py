@@ -0,0 +1,29 @@
+"""Shared fixtures.
+
+The MiniLM encoder is replaced with a deterministic hash-based embedding so
+the suite runs without downloading a model: identical texts map to identical
+unit vectors and distinct texts to near-orthogonal ones.
+"""
+
+from hashlib import blake2b
+from typing import Iterable
+
+import numpy as np
+import pytest
+
+from memory.vector_store import EMBEDDING_DIM
+
+
+def fake_embed(texts: Iterable[str], batch_size: int = 32) -> np.ndarray:
+    rows = []
+    for text in texts:
+        seed = int.from_bytes(blake2b(text.encode(), digest_size=8).digest(), "little")
+        row = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+        rows.append(row / np.linalg.norm(row))
+    return np.asarray(rows, dtype=np.float32).reshape(-1, EMBEDDING_DIM)
+
+
+@pytest.fixture(autouse=True)
+def _fake_embeddings(monkeypatch):
+    monkeypatch.setattr("memory.vector_store.embed", fake_embed)
+    monkeypatch.setattr("graph.nodes.embed", fake_embed)
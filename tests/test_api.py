@@ -0,0 +1,61 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+@pytest.fixture
+def client():
+    # No context manager: startup hooks (the flush task) are not needed here.
+    return TestClient(app)
+
+
+def test_discover_tools_returns_304_for_matching_etag(client):
+    first = client.get("/tools/discover")
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert "calendar.create_event" in first.json()
+
+    cached = client.get("/tools/discover", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+
+def test_discover_tools_returns_body_for_stale_etag(client):
+    response = client.get("/tools/discover", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/interact", b"{}"),
+        ("/interact", b"not json"),
+        ("/feedback", b'{"session_id": "s1", "rating": "five"}'),
+    ],
+)
+def test_invalid_body_returns_list_shaped_422(client, path, body):
+    response = client.post(path, content=body)
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert isinstance(detail, list)
+    assert detail[0]["loc"] == ["body"]
+    assert detail[0]["msg"]
+
+
+def test_numeric_strings_are_coerced(client):
+    response = client.post("/feedback", json={"session_id": "s1", "rating": "5"})
+
+    assert response.status_code == 200
+
+
+def test_request_schemas_are_published(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    schema = paths["/interact"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+
+    assert schema["required"] == ["input"]
+    assert "rating" in paths["/feedback"]["post"]["requestBody"]["content"]["application/json"]["schema"]["properties"]
@@ -0,0 +1,40 @@
+from memory.vector_store import FAISSMemory
+
+
+def _store() -> FAISSMemory:
+    store = FAISSMemory()
+    store.add(["alice likes tea"], user_id="alice", session_id="s1")
+    store.add(["alice likes hiking"], user_id="alice", session_id="s2")
+    store.add(["bob likes coffee"], user_id="bob", session_id="s1")
+    store.flush()
+    return store
+
+
+def test_writes_are_buffered_until_flush():
+    store = FAISSMemory(flush_every=2)
+    store.add(["alice likes tea"], user_id="alice")
+
+    assert store.recall("alice likes tea", user_id="alice") == []
+    store.flush()
+    assert store.recall("alice likes tea", user_id="alice") == ["alice likes tea"]
+
+
+def test_recall_is_scoped_to_user():
+    store = _store()
+
+    assert sorted(store.recall("likes", user_id="alice")) == ["alice likes hiking", "alice likes tea"]
+    assert store.recall("alice likes tea", user_id="bob") == ["bob likes coffee"]
+    assert store.recall("likes", user_id="carol") == []
+
+
+def test_recall_is_scoped_to_session():
+    store = _store()
+
+    assert store.recall("likes", user_id="alice", session_id="s2") == ["alice likes hiking"]
+    assert sorted(store.recall("likes", session_id="s1")) == ["alice likes tea", "bob likes coffee"]
+
+
+def test_recall_ranks_by_similarity():
+    store = _store()
+
+    assert store.recall("alice likes hiking", user_id="alice", k=1) == ["alice likes hiking"]
@@ -0,0 +1,45 @@
+import memory.vector_store as vector_store
+from cache.semantic_cache import SemanticCache
+
+
+def fake_embed(texts):
+    # Resolved at call time so the conftest stand-in is used.
+    return vector_store.embed(texts)
+
+
+def test_lookup_is_scoped_to_user():
+    cache = SemanticCache()
+    query = fake_embed(["email Ann the report"])
+    cache.insert(query, ["Ann"], "sent", "alice")
+
+    assert cache.lookup(query, ["Ann"], "alice") == "sent"
+    assert cache.lookup(query, ["Ann"], "bob") is None
+
+
+def test_lookup_requires_similar_input_and_entities():
+    cache = SemanticCache()
+    query = fake_embed(["email Ann the report"])
+    cache.insert(query, ["Ann"], "sent", "alice")
+
+    assert cache.lookup(fake_embed(["book a flight"]), ["Ann"], "alice") is None
+    assert cache.lookup(query, ["Bob"], "alice") is None
+
+
+def test_oldest_entries_are_evicted():
+    cache = SemanticCache(max_entries=2)
+    queries = fake_embed(["first", "second", "third"])
+    for i, name in enumerate(("first", "second", "third")):
+        cache.insert(queries[i : i + 1], [], name, "alice")
+
+    assert cache.index.ntotal == 2
+    assert cache.lookup(queries[0:1], [], "alice") is None
+    assert cache.lookup(queries[2:3], [], "alice") == "third"
+
+
+def test_eviction_forgets_users_without_entries():
+    cache = SemanticCache(max_entries=1)
+    cache.insert(fake_embed(["a"]), [], "a", "alice")
+    cache.insert(fake_embed(["b"]), [], "b", "bob")
+
+    assert cache.lookup(fake_embed(["a"]), [], "alice") is None
+    assert list(cache._user_ids) == ["bob"]
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import graph.workflow as workflow
+from mcp.tool_registry import registry
+
+TOOL = "calendar.create_event"
+
+
+@pytest.fixture
+def execution_cache(monkeypatch):
+    monkeypatch.setattr(workflow, "_CACHE_ENABLED", True)
+    workflow.cache_clear()
+    yield workflow._cache
+    workflow.cache_clear()
+
+
+@pytest.fixture
+def calendar_tool():
+    """Swap in a calendar tool whose behaviour the test controls."""
+    original = registry.get_tool(TOOL)
+    meta = dict(registry.get_tools_metadata()[TOOL])
+    calls = []
+
+    def install(func):
+        def tool(payload):
+            calls.append(payload)
+            return func(payload)
+
+        registry.register(TOOL, meta, tool)
+        return calls
+
+    yield install
+    registry.register(TOOL, meta, original)
+
+
+def test_cache_hit_reuses_run_with_current_input(execution_cache):
+    first = workflow.run_graph_once("u1", "s1", "hello there")
+    second = workflow.run_graph_once("u1", "s2", "  Hello There ")
+
+    assert len(execution_cache) == 1
+    assert second.response == first.response
+    assert second.user_input == "  Hello There "
+    assert second.session_id == "s2"
+
+
+def test_cache_misses_for_other_user(execution_cache):
+    workflow.run_graph_once("u1", None, "hello there")
+    workflow.run_graph_once("u2", None, "hello there")
+
+    assert len(execution_cache) == 2
+
+
+def test_cache_disabled_by_default():
+    workflow.cache_clear()
+    workflow.run_graph_once("u1", None, "hello there")
+
+    assert len(workflow._cache) == 0
+
+
+def test_failed_tool_run_is_not_cached(execution_cache, calendar_tool):
+    def flaky(payload):
+        if len(calls) == 1:
+            raise RuntimeError("transient")
+        return {}
+
+    calls = calendar_tool(flaky)
+    first = asyncio.run(workflow.arun_graph_once("u1", None, "Book a meeting with Ann"))
+    second = asyncio.run(workflow.arun_graph_once("u1", None, "Book a meeting with Ann"))
+
+    assert first.action_results == ["error: transient"]
+    assert second.action_results == ["ok"]
+    assert len(calls) == 2
+    assert len(execution_cache) == 0
+
+
+def test_successful_tool_run_is_not_cached(execution_cache, calendar_tool):
+    calls = calendar_tool(lambda payload: {})
+    for _ in range(2):
+        asyncio.run(workflow.arun_graph_once("u1", None, "Schedule meetings with Bob"))
+
+    assert len(calls) == 2
+    assert len(execution_cache) == 0
+
+
+def test_cancelled_tool_is_reported_as_error(calendar_tool):
+    def cancelled(payload):
+        raise asyncio.CancelledError()
+
+    calendar_tool(cancelled)
+    state = asyncio.run(workflow.arun_graph_once("u1", None, "Book a meeting with Ann"))
+
+    assert state.action_results == ["error: CancelledError"]
@@ -1,2 +1,2 @@
-from graph.workflow import run_graph_once as agent_run_once
+from graph.workflow import arun_graph_once as agent_run_once, astream_graph_once as agent_stream_once, cache_clear
 from mcp.mcp_adapter import mcp_adapter